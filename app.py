@@ -23,34 +23,477 @@ Date: 14/08/2025
 """
 
 import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox
+import numpy as np
 import pandas as pd
+import codecs
+import csv
+import importlib.util
+import io
 import os
-from logic import limpar_espacos_em_colunas, remover_duplicatas, filtrar_primeira_coluna_por_tamanho
+from logic import remover_duplicatas
 from tooltip import ToolTip
 
-def tentar_leitura_csv_variavel_sep(caminho_arquivo):
+try:
+    from charset_normalizer import from_bytes
+except ImportError:
+    from_bytes = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+CALAMINE_DISPONIVEL = importlib.util.find_spec('python_calamine') is not None
+TIPO_TEXTO = 'string[pyarrow]' if pa is not None else 'string'
+
+# Every character for which str.isspace() is true, listed explicitly instead of \s,
+# whose meaning differs between Python, RE2 (Arrow) and Rust (Polars). The characters
+# go into the pattern as-is, not as regex escapes, so all three engines read it the
+# same way. Runs of them are replaced by a single space. Like INVISIVEIS, it is kept
+# as a string because pandas falls back to Python for compiled re.Pattern objects on
+# Arrow strings.
+ESPACOS = '[\t\n\x0b\x0c\r \x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+'
+# Zero-width characters and the BOM are not whitespace and are deleted outright, so
+# they never split a value such as a key in two.
+INVISIVEIS = '[\u200b-\u200d\ufeff]'
+
+TAMANHO_AMOSTRA = 64 * 1024  # bytes usados para detectar separador e codificação
+SEPARADORES = [';', ',', '\t']
+# UTF-32 vem antes de UTF-16 porque o BOM UTF-32-LE começa com o BOM UTF-16-LE.
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+EXTENSOES_EXCEL = ['.xls', '.xlsx']
+EXTENSOES_TEXTO = ['.csv', '.txt']
+LINHAS_POR_BLOCO = 200_000  # linhas formatadas por vez ao salvar o TXT
+INTERVALO_POLL_MS = 50  # intervalo entre verificações de tarefas em segundo plano
+TAMANHO_CACHE = 2  # arquivos lidos mantidos em memória
+
+def _detectar_codificacao(amostra):
     """
-    Attempts to read a CSV or TXT file using common delimiters (;, ,, \t).
-    If the file has encoding issues, it tries both utf-8 and latin1.
-    Returns a pandas DataFrame if successful, or raises an exception otherwise.
-    
+    Guesses the text encoding of a byte sample taken from the start of a file.
+    A byte order mark decides the encoding directly and an ASCII-only sample is
+    read as UTF-8. Otherwise uses charset_normalizer when it is installed, or
+    checks whether the sample is valid UTF-8 and falls back to latin1.
+
+    Args: amostra (bytes): First bytes of the file.
+
+    Returns: str: Name of the detected encoding.
+    """
+    for bom, encoding in BOMS:
+        if amostra.startswith(bom):
+            return encoding
+    if amostra.isascii():
+        return 'utf-8'
+    if from_bytes is not None:
+        melhor = from_bytes(amostra).best()
+        if melhor is not None:
+            return melhor.encoding
+    try:
+        amostra.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A amostra pode ter cortado um caractere multibyte no final.
+        if e.start < len(amostra) - 3:
+            return 'latin1'
+    return 'utf-8'
+
+def _eh_utf8(encoding):
+    """
+    Tells whether bytes in the given encoding can be read as UTF-8 unchanged.
+
+    Args: encoding (str): Name of the encoding.
+
+    Returns: bool: True for UTF-8 and ASCII.
+    """
+    try:
+        return codecs.lookup(encoding).name in ('utf-8', 'ascii')
+    except LookupError:
+        return False
+
+def _converter_para_utf8(dados, encoding):
+    """
+    Decodes the raw bytes of a file once with the given encoding and returns
+    them as UTF-8, so the parser never has to retry with another encoding.
+
+    Args: dados (bytes): Raw contents of the file.
+          encoding (str): Encoding detected for the file.
+
+    Returns: bytes: The same contents encoded as UTF-8.
+    """
+    try:
+        texto = dados.decode(encoding)
+    except (UnicodeDecodeError, LookupError):
+        texto = dados.decode('latin1')
+    else:
+        if _eh_utf8(encoding):
+            return dados
+    return texto.encode('utf-8')
+
+def _detectar_separador(texto):
+    """
+    Sniffs the column delimiter (;, ,, \t) from a sample of the file's text.
+    If csv.Sniffer cannot decide, picks the delimiter that appears most often
+    in the first line, defaulting to ';'.
+
+    Args: texto (str): First characters of the file.
+
+    Returns: str: The detected delimiter.
+    """
+    try:
+        return csv.Sniffer().sniff(texto, delimiters=''.join(SEPARADORES)).delimiter
+    except csv.Error:
+        primeira_linha = texto.split('\n', 1)[0]
+        return max(SEPARADORES, key=primeira_linha.count)
+
+def _ler_amostra_csv(caminho_arquivo):
+    """
+    Reads a sample of the first bytes of a CSV or TXT file and detects its
+    encoding and delimiter.
+
     Args: caminho_arquivo (str): Path to the CSV or TXT file.
 
+    Returns: tuple: (decoded sample text, separator, encoding).
+    """
+    with open(caminho_arquivo, 'rb') as f:
+        amostra = f.read(TAMANHO_AMOSTRA)
+    encoding = _detectar_codificacao(amostra)
+    try:
+        texto = amostra.decode(encoding, errors='ignore')
+    except LookupError:
+        encoding = 'latin1'
+        texto = amostra.decode(encoding)
+    return texto, _detectar_separador(texto), encoding
+
+def _pular_linha_longa(linha):
+    """
+    Row handler for pyarrow's CSV reader matching pandas' on_bad_lines='skip':
+    rows with extra fields are skipped, while rows with missing fields abort the
+    Arrow read so the pandas C engine (which fills them with empty values) is used.
+
+    Args: linha (pyarrow.csv.InvalidRow): Row that does not match the header.
+
+    Returns: str: 'skip' or 'error'.
+    """
+    return 'skip' if linha.actual_columns > linha.expected_columns else 'error'
+
+def _ler_csv(dados, sep, posicoes=None):
+    """
+    Parses UTF-8 CSV or TXT contents with a known delimiter. Uses pyarrow's
+    multi-threaded parser when pyarrow is installed, falling back to the pandas
+    C engine. Every value is read as text and only empty fields are missing, as
+    in processar_csv_polars, so values such as 0012 or NA are exported exactly as
+    read. Rows with extra fields are skipped and rows with missing fields are
+    kept with empty values.
+
+    Args: dados (bytes): File contents encoded as UTF-8.
+          sep (str): Column delimiter.
+          posicoes (list of int, optional): Positions of the columns to load, in
+              the order they should appear; all columns if None.
+
     Returns: pd.DataFrame: Data read from the file.
     """
-    sep_list = [';', ',', '\t']
-    for sep in sep_list:
+    # Names as pandas gives them (blank and repeated headers renamed).
+    nomes = pd.read_csv(io.BytesIO(dados), sep=sep, quotechar='"', nrows=0).columns.tolist()
+    posicoes = list(range(len(nomes))) if posicoes is None else list(posicoes)
+    if pa is not None:
         try:
-            return pd.read_csv(caminho_arquivo, sep=sep, quotechar='"', encoding='utf-8', on_bad_lines='skip')
-        except UnicodeDecodeError:
-            try:
-                return pd.read_csv(caminho_arquivo, sep=sep, quotechar='"', encoding='latin1', on_bad_lines='skip')
-            except Exception:
-                continue
+            # Arrow columns are named by position, so the header text never has to match.
+            internos = [str(i) for i in range(len(nomes))]
+            selecionados = [internos[i] for i in posicoes]
+            tabela = pacsv.read_csv(
+                io.BytesIO(dados),
+                read_options=pacsv.ReadOptions(column_names=internos, skip_rows=1),
+                parse_options=pacsv.ParseOptions(delimiter=sep, quote_char='"', newlines_in_values=True,
+                                                  invalid_row_handler=_pular_linha_longa),
+                convert_options=pacsv.ConvertOptions(include_columns=selecionados,
+                                                     column_types={col: pa.string() for col in selecionados},
+                                                     null_values=[''], strings_can_be_null=True,
+                                                     quoted_strings_can_be_null=True),
+            )
+            df = tabela.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+            df.columns = [nomes[i] for i in posicoes]
+            return df
         except Exception:
-            continue
-    raise Exception("Não foi possível ler o arquivo com os separadores padrão")
+            pass
+    # Columns are selected afterwards: with usecols, the C engine stops skipping rows with extra fields.
+    df = pd.read_csv(io.BytesIO(dados), sep=sep, quotechar='"', encoding='utf-8', on_bad_lines='skip',
+                     dtype=str, keep_default_na=False, na_values=[''], engine='c')
+    return df.iloc[:, posicoes]
+
+def ler_excel(caminho_arquivo, **kwargs):
+    """
+    Reads an Excel file, using the calamine engine when python-calamine is
+    installed and the pandas default (openpyxl/xlrd) otherwise.
+
+    Args: caminho_arquivo (str): Path to the .xls or .xlsx file.
+          **kwargs: Extra arguments for pd.read_excel (e.g. nrows, usecols).
+
+    Returns: pd.DataFrame: Data read from the file.
+    """
+    if CALAMINE_DISPONIVEL:
+        try:
+            return pd.read_excel(caminho_arquivo, engine='calamine', **kwargs)
+        except (ImportError, ValueError):
+            pass
+    return pd.read_excel(caminho_arquivo, **kwargs)
+
+def tentar_leitura_csv_variavel_sep(caminho_arquivo, sep=None, encoding=None, posicoes=None):
+    """
+    Reads a CSV or TXT file. The file is read and converted to UTF-8 only once.
+    The delimiter (;, ,, \t) and encoding are sniffed from a sample of the file
+    unless they are given, e.g. when already detected by ler_colunas.
+    Returns a pandas DataFrame if successful, or raises an exception otherwise.
+    
+    Args: caminho_arquivo (str): Path to the CSV or TXT file.
+          sep (str, optional): Column delimiter.
+          encoding (str, optional): Text encoding of the file.
+          posicoes (list of int, optional): Positions of the columns to load, in
+              the order they should appear; all columns if None.
+
+    Returns: pd.DataFrame: Data read from the file.
+    """
+    with open(caminho_arquivo, 'rb') as f:
+        dados = f.read()
+    if encoding is None:
+        encoding = _detectar_codificacao(dados[:TAMANHO_AMOSTRA])
+    dados = _converter_para_utf8(dados, encoding)
+    if sep is None:
+        sep = _detectar_separador(dados[:TAMANHO_AMOSTRA].decode('utf-8', errors='ignore'))
+    return _ler_csv(dados, sep, posicoes)
+
+def ler_colunas(caminho_arquivo):
+    """
+    Reads only the header of an Excel, CSV, or TXT file.
+
+    Args: caminho_arquivo (str): Path to the file.
+
+    Returns: tuple: (list of column names, dict of reading options to pass to
+             ler_arquivo so the full read reuses the detected delimiter and encoding).
+    """
+    ext = os.path.splitext(caminho_arquivo)[1].lower()
+    if ext in EXTENSOES_EXCEL:
+        return ler_excel(caminho_arquivo, nrows=0).columns.tolist(), {}
+    if ext in EXTENSOES_TEXTO:
+        texto, sep, encoding = _ler_amostra_csv(caminho_arquivo)
+        cabecalho = pd.read_csv(io.StringIO(texto), sep=sep, quotechar='"', nrows=0)
+        return cabecalho.columns.tolist(), {'sep': sep, 'encoding': encoding}
+    raise Exception("Tipo de arquivo não suportado.")
+
+def ler_arquivo(caminho_arquivo, posicoes, colunas, **opcoes):
+    """
+    Reads an Excel, CSV, or TXT file, loading only the requested columns.
+    Columns are selected by position, so headers that are numbers (e.g. years in
+    Excel) or that decode differently in the full read still match.
+
+    Args: caminho_arquivo (str): Path to the file.
+          posicoes (list of int): Positions of the columns to load, in order.
+          colunas (list of str): Names given to those columns, as read by ler_colunas.
+          **opcoes: Reading options returned by ler_colunas.
+
+    Returns: pd.DataFrame: Data read from the file.
+    """
+    ext = os.path.splitext(caminho_arquivo)[1].lower()
+    if ext in EXTENSOES_EXCEL:
+        ordem_arquivo = sorted(posicoes)
+        df = ler_excel(caminho_arquivo, usecols=ordem_arquivo)
+        df = df.iloc[:, [ordem_arquivo.index(i) for i in posicoes]]
+    elif ext in EXTENSOES_TEXTO:
+        df = tentar_leitura_csv_variavel_sep(caminho_arquivo, posicoes=posicoes, **opcoes)
+    else:
+        raise Exception("Tipo de arquivo não suportado.")
+    df.columns = colunas
+    return df
+
+def limpar_espacos(df, colunas):
+    """
+    Deletes zero-width characters, collapses every run of whitespace into a single
+    space and strips leading and trailing spaces, using vectorized regex
+    replacements on each column.
+
+    Args: df (pd.DataFrame): Data whose columns already have a string dtype.
+          colunas (list of str): Columns to clean.
+
+    Returns: tuple: (cleaned DataFrame, number of whitespace characters removed).
+    """
+    total_espacos_removidos = 0
+    for col in colunas:
+        limpo = df[col].str.replace(INVISIVEIS, '', regex=True) \
+            .str.replace(ESPACOS, ' ', regex=True).str.strip(' ')
+        total_espacos_removidos += int((df[col].str.len() - limpo.str.len()).sum())
+        df[col] = limpo
+    return df, total_espacos_removidos
+
+def _filtrar_por_tamanho(df, primeira_col, min_len):
+    """
+    Removes rows whose first column has fewer than min_len characters, using the
+    string dtype's vectorized .str.len(). Empty values count as shorter than
+    min_len, as in _filtrar_e_deduplicar_arrow.
+
+    Args: df (pd.DataFrame): Data whose first column has a string dtype.
+          primeira_col (str): Name of the first column.
+          min_len (int): Minimum number of characters in the first column.
+
+    Returns: tuple: (filtered DataFrame, rows removed by length).
+    """
+    tamanho_ok = (df[primeira_col].str.len().fillna(0) >= min_len).to_numpy(dtype=bool)
+    return df[tamanho_ok], int((~tamanho_ok).sum())
+
+def _filtrar_e_deduplicar_arrow(df, primeira_col, min_len):
+    """
+    Removes rows whose first column has fewer than min_len characters and then
+    duplicates of the first column (keeping the first occurrence), computing the
+    rows to keep with Arrow kernels and selecting them from the DataFrame once.
+    Empty values count as shorter than min_len.
+
+    The key is dictionary-encoded, which numbers the distinct values in order of
+    first appearance, so a row is the first occurrence of its value exactly when
+    its code is larger than every code before it. This needs a single hash pass
+    over the strings instead of a hash aggregation followed by a sort.
+
+    Args: df (pd.DataFrame): Data whose first column holds Arrow-backed strings.
+          primeira_col (str): Name of the first column.
+          min_len (int): Minimum number of characters in the first column.
+
+    Returns: tuple: (filtered DataFrame, rows removed by length, duplicates removed).
+    """
+    chave = pa.array(df[primeira_col])
+    if isinstance(chave, pa.ChunkedArray):
+        chave = chave.combine_chunks()
+    tamanho_ok = pc.fill_null(pc.greater_equal(pc.utf8_length(chave), min_len), False)
+    posicoes = pc.indices_nonzero(tamanho_ok)
+    codigos = pc.dictionary_encode(chave.take(posicoes), null_encoding='encode').indices.to_numpy()
+    maior_anterior = np.maximum.accumulate(np.concatenate(([-1], codigos[:-1])))
+    linhas = posicoes.to_numpy()[codigos > maior_anterior]
+    return df.iloc[linhas], len(df) - len(posicoes), len(posicoes) - len(linhas)
+
+def processar_csv_polars(caminho_arquivo, sep, posicoes, colunas_selecionadas, min_len):
+    """
+    Polars version of the read and cleaning pipeline for UTF-8 CSV or TXT files:
+    normalizes whitespace as limpar_espacos does, filters rows by the length of
+    the first column, and removes duplicates based on the first column (keeping
+    the first occurrence). All columns are read as text, as in _ler_csv.
+
+    Columns are selected by position, because Polars names blank and repeated
+    headers differently from pandas. Raises pl.exceptions.PolarsError when the
+    file is not valid UTF-8 or has rows with extra fields (which the pandas path
+    skips), so the caller can fall back to pandas.
+
+    Args: caminho_arquivo (str): Path to the CSV or TXT file.
+          sep (str): Column delimiter.
+          posicoes (list of int): Positions of the selected columns in the file.
+          colunas_selecionadas (list of str): Names of the selected columns, in order.
+          min_len (int): Minimum number of characters in the first column.
+
+    Returns: tuple: (cleaned pl.DataFrame, spaces removed, rows removed by length,
+             duplicates removed).
+    """
+    primeira_col = colunas_selecionadas[0]
+    df = pl.scan_csv(
+        caminho_arquivo, separator=sep, quote_char='"', infer_schema=False
+    ).select(pl.nth(*posicoes)).collect()
+    df.columns = colunas_selecionadas
+    # Polars reads blank lines as rows of nulls; drops them as processar_dados does.
+    df = df.filter(~pl.all_horizontal(pl.all().is_null()))
+
+    df_limpo = df.with_columns(
+        pl.col(colunas_selecionadas).str.replace_all(INVISIVEIS, '').str.replace_all(ESPACOS, ' ').str.strip_chars(' ')
+    )
+    total_espacos_removidos = sum(
+        (df[col].str.len_chars() - df_limpo[col].str.len_chars()).sum() for col in colunas_selecionadas
+    )
+
+    df_filtrado = df_limpo.filter(pl.col(primeira_col).str.len_chars().fill_null(0) >= min_len)
+    df_unico = df_filtrado.unique(subset=primeira_col, keep='first', maintain_order=True)
+
+    return (df_unico, int(total_espacos_removidos),
+            len(df_limpo) - len(df_filtrado), len(df_filtrado) - len(df_unico))
+
+def processar_dados(df, colunas_selecionadas, min_len):
+    """
+    Applies the cleaning pipeline to the selected columns: whitespace removal,
+    minimum length filter on the first column, and duplicate removal based on
+    the first column. Rows where every selected field is empty are dropped
+    before counting. Runs outside the Tk main thread.
+
+    Args: df (pd.DataFrame): Data holding exactly the selected columns, in order.
+              It is owned by the caller and may be modified.
+          colunas_selecionadas (list of str): Columns to export, in order.
+          min_len (int): Minimum number of characters in the first column.
+
+    Returns: tuple: (cleaned DataFrame, spaces removed, rows removed by length,
+             duplicates removed).
+    """
+    primeira_col = colunas_selecionadas[0]
+
+    # Rows with every selected field empty (blank lines, ';' only) are ignored, not counted.
+    df = df.dropna(how='all')
+
+    # Arrow-backed strings (when pyarrow is installed) let the .str operations run on compiled kernels.
+    df = df.astype({col: TIPO_TEXTO for col in colunas_selecionadas})
+
+    # Cleans whitespace in all selected columns.
+    df_filtrado, total_espacos_removidos = limpar_espacos(df, colunas_selecionadas)
+
+    if pa is not None:
+        # Filters by length and removes duplicates in a single pass over the first column.
+        df_filtrado, linhas_removidas_por_tamanho, total_duplicatas_removidas = _filtrar_e_deduplicar_arrow(
+            df_filtrado, primeira_col, min_len
+        )
+    else:
+        # Filters rows where the first column has fewer than min_len characters.
+        df_filtrado, linhas_removidas_por_tamanho = _filtrar_por_tamanho(df_filtrado, primeira_col, min_len)
+
+        # Removes duplicates based on the first column.
+        df_filtrado, total_duplicatas_removidas = remover_duplicatas(df_filtrado, primeira_col)
+
+    return df_filtrado, total_espacos_removidos, linhas_removidas_por_tamanho, total_duplicatas_removidas
+
+def salvar_txt(df, caminho_arquivo):
+    """
+    Saves a DataFrame as a semicolon-delimited UTF-8 (with BOM) TXT file,
+    streaming it to the file in chunks so large frames are never formatted all
+    at once.
+
+    Args: df (pd.DataFrame or pl.DataFrame): Data to be saved.
+          caminho_arquivo (str): Path of the output file.
+    """
+    if pl is not None and isinstance(df, pl.DataFrame):
+        df.write_csv(caminho_arquivo, separator=';', include_bom=True, line_terminator='\n')
+        return
+    with open(caminho_arquivo, 'wb') as f:
+        f.write(codecs.BOM_UTF8)
+        df.to_csv(f, sep=';', index=False, encoding='utf-8',
+                  lineterminator='\n', chunksize=LINHAS_POR_BLOCO)
+
+def _group_ranges(indices):
+    """
+    Groups a collection of integer indices into contiguous (first, last) ranges.
+
+    Args: indices (iterable of int): Indices to group, in any order.
+
+    Returns: list of tuple: Inclusive (first, last) pairs in ascending order.
+    """
+    intervalos = []
+    for index in sorted(set(indices)):
+        if intervalos and index == intervalos[-1][1] + 1:
+            intervalos[-1][1] = index
+        else:
+            intervalos.append([index, index])
+    return [tuple(intervalo) for intervalo in intervalos]
 
 class UnifiedApp:
     """
@@ -63,10 +506,17 @@ class UnifiedApp:
         Args: root (tk.Tk): Instance of the Tkinter main window.
         """
         self.root = root
-        self.df = None
+        self.caminho_arquivo = None
+        self._opcoes_leitura = {}
+        self._colunas_arquivo = []
+        self._colunas = []
         self.total_espacos_removidos = 0
         self.linhas_removidas_por_tamanho = 0
         self.total_duplicatas_removidas = 0
+        self.min_len_usado = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._cache = OrderedDict()
+        self._tooltip_pendente = False
         self._build_ui()
 
     def _build_ui(self):
@@ -77,17 +527,16 @@ class UnifiedApp:
         self.root.title("Preparador XLS/CSV → TXT")
         self.root.geometry("600x550")
 
-        btn_select = tk.Button(self.root, text="Selecionar arquivo", command=self.selecionar_arquivo, font=("Arial", 12))
-        btn_select.pack(pady=10)
+        self.btn_selecionar = tk.Button(self.root, text="Selecionar arquivo", command=self.selecionar_arquivo, font=("Arial", 12))
+        self.btn_selecionar.pack(pady=10)
 
         # Campo para definir mínimo de dígitos logo abaixo do botão
         frame_min_len = tk.Frame(self.root)
         frame_min_len.pack(pady=(0, 10))
         tk.Label(frame_min_len, text="Mínimo de dígitos na 1ª coluna:").pack(side=tk.LEFT)
-        self.spin_min_len = tk.Spinbox(frame_min_len, from_=1, to=100, width=5)
+        self.min_len_var = tk.IntVar(self.root, value=6)  # padrão 6
+        self.spin_min_len = tk.Spinbox(frame_min_len, from_=1, to=100, width=5, textvariable=self.min_len_var)
         self.spin_min_len.pack(side=tk.LEFT, padx=5)
-        self.spin_min_len.delete(0, "end")
-        self.spin_min_len.insert(0, "6")  # padrão 6
 
         self.label_resultado = tk.Label(self.root, text="", font=("Arial", 10), wraplength=580, justify="center")
         self.label_resultado.pack(pady=(0, 5))
@@ -113,14 +562,15 @@ class UnifiedApp:
         tk.Button(frame_botoes, text="↓ Mover para baixo", command=self.mover_baixo).grid(row=0, column=1, padx=10, pady=5)
         tk.Button(frame_botoes, text="✖ Remover selecionadas", command=self.remover_colunas, fg="red").grid(row=0, column=2, padx=10, pady=5)
 
-        btn_generate = tk.Button(self.root, text="Gerar arquivo TXT", command=self.gerar_txt, font=("Arial", 12), bg="#4CAF50", fg="white")
-        btn_generate.pack(pady=20)
+        self.btn_gerar = tk.Button(self.root, text="Gerar arquivo TXT", command=self.gerar_txt, font=("Arial", 12), bg="#4CAF50", fg="white")
+        self.btn_gerar.pack(pady=20)
 
     def selecionar_arquivo(self):
         """
         Opens a dialog for selecting an Excel, CSV, or TXT file.
-        Performs the appropriate reading method depending on the file extension.
-        Updates the column list displayed in the interface.
+        Reads only the file's header, in the background; the data itself is loaded
+        in gerar_txt. The column list is updated by _arquivo_carregado. Both buttons
+        stay disabled while the header is read.
         """
         caminho_arquivo = filedialog.askopenfilename(
             title="Selecione um arquivo Excel, CSV ou TXT",
@@ -136,24 +586,71 @@ class UnifiedApp:
             self.icone_info.pack_forget()
             return
 
-        ext = os.path.splitext(caminho_arquivo)[1].lower()
+        texto_anterior = self.label_resultado.cget("text")
+        self.label_resultado.config(text="Carregando arquivo...")
+        self._bloquear_botoes(True)
+
+        def concluido(resultado):
+            self._bloquear_botoes(False)
+            self._arquivo_carregado(caminho_arquivo, *resultado)
+
+        def falha(e):
+            self._bloquear_botoes(False)
+            self.label_resultado.config(text=texto_anterior)
+            messagebox.showerror("Erro", f"Falha ao ler o arquivo:\n{e}")
+
+        futuro = self._executor.submit(ler_colunas, caminho_arquivo)
+        self._poll(futuro, concluido, falha)
 
+    def _bloquear_botoes(self, bloquear):
+        """
+        Disables or re-enables the select and generate buttons while a background
+        task runs, so the status label captured before it is never a transient one.
+
+        Args: bloquear (bool): True to disable the buttons, False to enable them.
+        """
+        estado = tk.DISABLED if bloquear else tk.NORMAL
+        self.btn_selecionar.config(state=estado)
+        self.btn_gerar.config(state=estado)
+
+    def _arquivo_carregado(self, caminho_arquivo, colunas, opcoes_leitura):
+        """
+        Updates the interface once the header of the selected file has been read.
+
+        Args: caminho_arquivo (str): Path to the selected file.
+              colunas (list of str): Column names read from the file.
+              opcoes_leitura (dict): Reading options returned by ler_colunas.
+        """
+        self.caminho_arquivo = caminho_arquivo
+        self._opcoes_leitura = opcoes_leitura
+        self._colunas_arquivo = list(colunas)
+        self.label_resultado.config(text=f"Arquivo carregado: {caminho_arquivo}")
+        self._carregar_colunas(colunas)
+        self.icone_info.pack(pady=(0, 10))
+        self.total_espacos_removidos = 0
+        self.linhas_removidas_por_tamanho = 0
+        self.total_duplicatas_removidas = 0
+        self.min_len_usado = None
+        self._schedule_tooltip()
+
+    def _poll(self, futuro, ao_concluir, ao_falhar):
+        """
+        Checks periodically, from the Tk main loop, whether a background task has
+        finished, and then calls the matching callback on the main thread.
+
+        Args: futuro (concurrent.futures.Future): Task submitted to self._executor.
+              ao_concluir (callable): Receives the task result on success.
+              ao_falhar (callable): Receives the exception raised by the task.
+        """
+        if not futuro.done():
+            self.root.after(INTERVALO_POLL_MS, self._poll, futuro, ao_concluir, ao_falhar)
+            return
         try:
-            if ext in ['.xls', '.xlsx']:
-                self.df = pd.read_excel(caminho_arquivo)
-            elif ext in ['.csv', '.txt']:
-                self.df = tentar_leitura_csv_variavel_sep(caminho_arquivo)
-            else:
-                raise Exception("Tipo de arquivo não suportado.")
-            self.label_resultado.config(text=f"Arquivo carregado: {caminho_arquivo}")
-            self._carregar_colunas(self.df.columns.tolist())
-            self.icone_info.pack(pady=(0, 10))
-            self.total_espacos_removidos = 0
-            self.linhas_removidas_por_tamanho = 0
-            self.total_duplicatas_removidas = 0
-            self._atualizar_tooltip()
+            resultado = futuro.result()
         except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao ler o arquivo:\n{e}")
+            ao_falhar(e)
+            return
+        ao_concluir(resultado)
 
     def _carregar_colunas(self, colunas):
         """
@@ -161,120 +658,230 @@ class UnifiedApp:
         
         Args: colunas (list of str): List of column names.
         """
-        self.listbox_colunas.delete(0, tk.END)
-        for col in colunas:
-            self.listbox_colunas.insert(tk.END, col)
+        self._colunas = list(colunas)
+        self._refresh_listbox()
 
     def mover_cima(self):
         """
         Moves the selected columns up in the list, allowing reordering.
         """
         selecionados = self.listbox_colunas.curselection()
+        if not selecionados:
+            return
+        itens = self._colunas
+        nova_selecao = []
+        limite = 0  # primeira posição livre para onde um item pode subir
         for index in selecionados:
-            if index == 0:
-                continue
-            texto = self.listbox_colunas.get(index)
-            acima = self.listbox_colunas.get(index - 1)
-            self.listbox_colunas.delete(index - 1, index)
-            self.listbox_colunas.insert(index - 1, texto)
-            self.listbox_colunas.insert(index, acima)
-            self.listbox_colunas.selection_set(index - 1)
-            self.listbox_colunas.selection_clear(index)
+            if index > limite:
+                itens[index - 1], itens[index] = itens[index], itens[index - 1]
+                nova_selecao.append(index - 1)
+            else:
+                nova_selecao.append(index)
+                limite = index + 1
+        self._refresh_listbox(nova_selecao)
 
     def mover_baixo(self):
         """
         Moves the selected columns down in the list, allowing reordering.
         """
         selecionados = self.listbox_colunas.curselection()
-        count = self.listbox_colunas.size()
+        if not selecionados:
+            return
+        itens = self._colunas
+        nova_selecao = []
+        limite = len(itens) - 1  # última posição livre para onde um item pode descer
         for index in reversed(selecionados):
-            if index == count - 1:
-                continue
-            texto = self.listbox_colunas.get(index)
-            abaixo = self.listbox_colunas.get(index + 1)
-            self.listbox_colunas.delete(index, index + 1)
-            self.listbox_colunas.insert(index, abaixo)
-            self.listbox_colunas.insert(index + 1, texto)
-            self.listbox_colunas.selection_set(index + 1)
-            self.listbox_colunas.selection_clear(index)
+            if index < limite:
+                itens[index + 1], itens[index] = itens[index], itens[index + 1]
+                nova_selecao.append(index + 1)
+            else:
+                nova_selecao.append(index)
+                limite = index - 1
+        self._refresh_listbox(nova_selecao)
+
+    def _refresh_listbox(self, selecionados=()):
+        """
+        Redraws the Listbox from self._colunas in a single pass and reapplies the
+        selection, one selection_set call per contiguous run of indices.
+
+        Args: selecionados (iterable of int): Indices to select after redrawing.
+        """
+        self.listbox_colunas.delete(0, tk.END)
+        self.listbox_colunas.insert(tk.END, *self._colunas)
+        for inicio, fim in _group_ranges(selecionados):
+            self.listbox_colunas.selection_set(inicio, fim)
 
     def remover_colunas(self):
         """
         Removes the selected columns from the list of columns to be processed.
         """
-        selecionados = self.listbox_colunas.curselection()
-        for index in reversed(selecionados):
-            self.listbox_colunas.delete(index)
+        selecionados = set(self.listbox_colunas.curselection())
+        if not selecionados:
+            return
+        self._colunas = [col for index, col in enumerate(self._colunas) if index not in selecionados]
+        self._refresh_listbox()
 
-    def _atualizar_tooltip(self):
+    def _schedule_tooltip(self):
+        """
+        Schedules a tooltip update for when the Tk event loop is idle, so several
+        changes in the same event produce a single update.
+        """
+        if self._tooltip_pendente:
+            return
+        self._tooltip_pendente = True
+        self.root.after_idle(self._flush_tooltip)
+
+    def _flush_tooltip(self):
         """
         Updates the tooltip text to display a summary of the operations performed,
         such as the number of spaces removed, rows discarded due to length,
-        and duplicates removed.
+        and duplicates removed. The minimum length shown is the one used to compute
+        the counters, or the current field value before any file is generated.
         """
-        texto_base = "Limpeza de dados:"
-        texto_espacos = f"\nEspaçamentos removidos: {self.total_espacos_removidos}"
-        texto_tamanho = f"\nLinhas removidas (menores que {self.spin_min_len.get()} digitos): {self.linhas_removidas_por_tamanho}"
-        texto_duplicatas = f"\nDuplicatas removidas: {self.total_duplicatas_removidas}"
-        self.tooltip.texto = texto_base + texto_espacos + texto_tamanho + texto_duplicatas
+        self._tooltip_pendente = False
+        min_len = self.min_len_usado if self.min_len_usado is not None else self.spin_min_len.get()
+        self.tooltip.texto = "".join([
+            "Limpeza de dados:",
+            f"\nEspaçamentos removidos: {self.total_espacos_removidos}",
+            f"\nLinhas removidas (menores que {min_len} digitos): {self.linhas_removidas_por_tamanho}",
+            f"\nDuplicatas removidas: {self.total_duplicatas_removidas}",
+        ])
 
     def gerar_txt(self):
         """
-        Performs data cleaning, filtering by minimum length, and duplicate removal,
-        and saves the resulting DataFrame as a semicolon-delimited TXT file.
-        Displays success or error messages to the user.
+        Validates the options, reporting every problem in a single warning, and asks
+        where to save the TXT file. The selected columns are then processed and saved
+        in the background: loaded from the file, cleaned, filtered by minimum length,
+        deduplicated, and written as a semicolon-delimited TXT file. While that runs,
+        the status label shows "Processando..." and both buttons are disabled.
         """
-        if self.df is None:
-            messagebox.showwarning("Aviso", "Nenhum arquivo carregado.")
+        erros = []
+        if self.caminho_arquivo is None:
+            erros.append("Nenhum arquivo carregado.")
+
+        colunas_selecionadas = list(self._colunas)
+        if self.caminho_arquivo is not None and not colunas_selecionadas:
+            erros.append("Selecione pelo menos uma coluna.")
+
+        # IntVar.get() truncaria "6.5" para 6; só aceita dígitos, como int() fazia.
+        texto_min_len = self.spin_min_len.get().strip()
+        min_len = int(texto_min_len) if texto_min_len.isdecimal() else 0
+        if min_len < 1:
+            erros.append("Digite um número inteiro válido para o mínimo de caracteres.")
+
+        if erros:
+            messagebox.showwarning("Aviso", "\n".join(erros))
             return
 
-        colunas_selecionadas = list(self.listbox_colunas.get(0, tk.END))
-        if not colunas_selecionadas:
-            messagebox.showwarning("Aviso", "Selecione pelo menos uma coluna.")
+        caminho_save = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Arquivo TXT", "*.txt")],
+            title="Salvar arquivo TXT"
+        )
+        if not caminho_save:
             return
 
-        try:
-            min_len = int(self.spin_min_len.get())
-            if min_len < 1:
-                raise ValueError
-        except ValueError:
-            messagebox.showwarning("Aviso", "Digite um número inteiro válido para o mínimo de caracteres.")
-            return
+        posicoes = [self._colunas_arquivo.index(col) for col in colunas_selecionadas]
 
-        primeira_col = colunas_selecionadas[0]
+        # Mostra o andamento e impede que outro clique enfileire uma leitura ou gravação.
+        texto_anterior = self.label_resultado.cget("text")
+        self.label_resultado.config(text="Processando...")
+        self._bloquear_botoes(True)
 
-        # Cleans whitespace in all selected columns.
-        df_filtrado, self.total_espacos_removidos = limpar_espacos_em_colunas(
-            self.df[colunas_selecionadas].copy(), colunas_selecionadas
-        )
+        def restaurar():
+            self.label_resultado.config(text=texto_anterior)
+            self._bloquear_botoes(False)
 
-        # Filters rows where the first column has fewer than min_len characters.
-        df_filtrado, self.linhas_removidas_por_tamanho = filtrar_primeira_coluna_por_tamanho(
-            df_filtrado, primeira_col, min_len=min_len
-        )
+        def concluido(resultado):
+            restaurar()
+            self._arquivo_gerado(caminho_save, resultado)
 
-        # Removes duplicates based on the first column.
-        df_filtrado, self.total_duplicatas_removidas = remover_duplicatas(df_filtrado, primeira_col)
+        def falha(e):
+            restaurar()
+            messagebox.showerror("Erro", f"Falha ao gerar o arquivo:\n{e}")
 
-        self._atualizar_tooltip()
+        futuro = self._executor.submit(
+            self._gerar_arquivo, self.caminho_arquivo, self._opcoes_leitura,
+            posicoes, colunas_selecionadas, min_len, caminho_save
+        )
+        self._poll(futuro, concluido, falha)
 
-        caminho_save = filedialog.asksaveasfilename(
-            defaultextension=".txt",
-            filetypes=[("Arquivo TXT", "*.txt")],
-            title="Salvar arquivo TXT"
+    def _gerar_arquivo(self, caminho_arquivo, opcoes_leitura, posicoes, colunas_selecionadas, min_len, caminho_save):
+        """
+        Processes the selected columns with _ler_e_processar and saves the result.
+        Runs in the background worker.
+
+        Args: caminho_arquivo (str): Path to the file.
+              opcoes_leitura (dict): Reading options returned by ler_colunas.
+              posicoes (list of int): Positions of the selected columns in the file.
+              colunas_selecionadas (list of str): Columns to export, in order.
+              min_len (int): Minimum number of characters in the first column.
+              caminho_save (str): Path of the output TXT file.
+
+        Returns: tuple: (spaces removed, rows removed by length, duplicates removed,
+                 min_len used).
+        """
+        df_filtrado, *contagens = self._ler_e_processar(
+            caminho_arquivo, opcoes_leitura, posicoes, colunas_selecionadas, min_len
         )
-        if not caminho_save:
-            return
+        salvar_txt(df_filtrado, caminho_save)
+        return (*contagens, min_len)
 
-        try:
-            df_filtrado.to_csv(caminho_save, sep=';', index=False, encoding='utf-8-sig')
-            messagebox.showinfo(
-                "Sucesso",
-                f"Arquivo salvo em:\n{caminho_save}\n"
-                f"Linhas removidas por tamanho: {self.linhas_removidas_por_tamanho}"
-            )
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao salvar o arquivo:\n{e}")
+    def _ler_e_processar(self, caminho_arquivo, opcoes_leitura, posicoes, colunas_selecionadas, min_len):
+        """
+        Loads the selected columns and runs processar_dados on them. Runs in the
+        background worker, which is the only place self._cache is used.
+
+        UTF-8 CSV and TXT files go through processar_csv_polars when Polars is
+        installed, falling back to pandas if Polars cannot read them. Otherwise
+        the data read is cached by (path, modification time),
+        keeping the last TAMANHO_CACHE files, so generating the TXT again for an
+        unchanged file does not parse it again.
+
+        Args: caminho_arquivo (str): Path to the file.
+              opcoes_leitura (dict): Reading options returned by ler_colunas.
+              posicoes (list of int): Positions of the selected columns in the file.
+              colunas_selecionadas (list of str): Columns to export, in order.
+              min_len (int): Minimum number of characters in the first column.
+
+        Returns: tuple: Value returned by processar_dados.
+        """
+        sep = opcoes_leitura.get('sep')
+        if pl is not None and sep is not None and _eh_utf8(opcoes_leitura['encoding']):
+            try:
+                return processar_csv_polars(caminho_arquivo, sep, posicoes, colunas_selecionadas, min_len)
+            except pl.exceptions.PolarsError:
+                # O trecho amostrado era UTF-8, mas o restante do arquivo não, ou há linhas irregulares.
+                pass
+
+        chave = (caminho_arquivo, os.path.getmtime(caminho_arquivo))
+        df = self._cache.get(chave)
+        if df is None or not set(colunas_selecionadas).issubset(df.columns):
+            df = ler_arquivo(caminho_arquivo, posicoes, colunas_selecionadas, **opcoes_leitura)
+            self._cache[chave] = df
+        self._cache.move_to_end(chave)
+        while len(self._cache) > TAMANHO_CACHE:
+            self._cache.popitem(last=False)
+
+        # Selecting the columns builds a new frame, so the cached one is never modified.
+        return processar_dados(df[colunas_selecionadas], colunas_selecionadas, min_len)
+
+    def _arquivo_gerado(self, caminho_save, contagens):
+        """
+        Updates the counters and tooltip with the processing summary and tells the
+        user where the TXT file was saved.
+
+        Args: caminho_save (str): Path of the output TXT file.
+              contagens (tuple): Value returned by _gerar_arquivo.
+        """
+        (self.total_espacos_removidos, self.linhas_removidas_por_tamanho,
+         self.total_duplicatas_removidas, self.min_len_usado) = contagens
+        self._schedule_tooltip()
+        messagebox.showinfo(
+            "Sucesso",
+            f"Arquivo salvo em:\n{caminho_save}\n"
+            f"Linhas removidas por tamanho: {self.linhas_removidas_por_tamanho}"
+        )
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,19 @@
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.py imports these helper modules at load time; the functions under test do
+# not use them, so minimal placeholders are registered when they are absent.
+try:
+    import tooltip  # noqa: F401
+except ImportError:
+    sys.modules['tooltip'] = types.SimpleNamespace(ToolTip=object)
+
+try:
+    import logic  # noqa: F401
+except ImportError:
+    sys.modules['logic'] = types.SimpleNamespace(
+        remover_duplicatas=lambda df, col: (df.drop_duplicates(subset=col), len(df) - len(df.drop_duplicates(subset=col)))
+    )
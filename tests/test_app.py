@@ -0,0 +1,74 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pa = pytest.importorskip("pyarrow")
+
+import app
+
+
+def test_filtrar_e_deduplicar_arrow_coluna_com_varios_blocos():
+    valores = ['abcd', 'ab', 'xyzw', 'abcd', None, 'qqqqq', 'xyzw']
+    chave = pd.Series(pd.arrays.ArrowStringArray(pa.chunked_array([valores[:3], valores[3:]])))
+    df = pd.DataFrame({'k': chave, 'v': range(len(valores))})
+
+    df_filtrado, linhas_removidas, duplicatas = app._filtrar_e_deduplicar_arrow(df, 'k', 4)
+
+    assert df_filtrado['v'].tolist() == [0, 2, 5]
+    assert linhas_removidas == 2
+    assert duplicatas == 2
+
+
+def _gerar(monkeypatch, tmp_path, conteudo, posicoes, min_len, usar_polars):
+    if not usar_polars:
+        monkeypatch.setattr(app, 'pl', None)
+    caminho = tmp_path / 'entrada.csv'
+    caminho.write_bytes(conteudo)
+    colunas, opcoes = app.ler_colunas(str(caminho))
+    selecionadas = [colunas[i] for i in posicoes]
+    aplicativo = app.UnifiedApp.__new__(app.UnifiedApp)
+    aplicativo._cache = app.OrderedDict()
+    saida = tmp_path / 'saida.txt'
+    contagens = aplicativo._gerar_arquivo(str(caminho), opcoes, posicoes, selecionadas, min_len, str(saida))
+    return contagens, saida.read_bytes()
+
+
+@pytest.mark.parametrize('conteudo, posicoes', [
+    # Texto preservado: zeros à esquerda e "NA" não são convertidos.
+    (b'k;v\n0012;NA\n 12 ;1\n0012;2\n;3\n', [0, 1]),
+    # Cabeçalhos em branco e repetidos.
+    (b'id;;id;v\nabcd;1;2;3\nabcd;4;5;6\nefgh;7;8;NA\n', [0, 3, 2, 1]),
+    # Linhas com campos a mais são descartadas; com campos a menos, mantidas.
+    (b'k;v\naaaa;1\nbbbb;2;3\ncccc\ndddd;4\n', [0, 1]),
+    # Amostra inicial em UTF-8 com um byte latin1 depois de 64 KiB.
+    ('código;nome\n'.encode('utf-8') + b'abcdef;x\n' * 10000 + 'çççççç;é\n'.encode('latin1'), [0, 1]),
+    # Linhas em branco e linhas só com separadores não entram na contagem.
+    (b'k;v\nabcd;1\n\nefgh;2\n;\n\n', [0, 1]),
+], ids=['texto', 'cabecalhos', 'linhas_irregulares', 'latin1_tardio', 'linhas_em_branco'])
+def test_caminhos_polars_e_pandas_geram_o_mesmo_arquivo(monkeypatch, tmp_path, conteudo, posicoes):
+    pytest.importorskip("polars")
+    com_polars = _gerar(monkeypatch, tmp_path, conteudo, posicoes, 4, usar_polars=True)
+    sem_polars = _gerar(monkeypatch, tmp_path, conteudo, posicoes, 4, usar_polars=False)
+    assert com_polars == sem_polars
+
+
+@pytest.mark.parametrize('tipo', ['string[pyarrow]', 'string[python]'])
+def test_limpar_espacos_igual_em_todos_os_motores(tipo):
+    valores = [' a\x0bb\x1cc ', '1234​56', '﻿ab 　cd ', 'x\t\ny', None]
+    df = pd.DataFrame({'k': pd.Series(valores, dtype=tipo)})
+
+    df_limpo, removidos = app.limpar_espacos(df, ['k'])
+
+    assert df_limpo['k'].tolist()[:4] == ['a b c', '123456', 'ab cd', 'x y']
+    assert removidos == 7
+
+
+def test_ler_arquivo_excel_com_cabecalhos_numericos(tmp_path):
+    pytest.importorskip("openpyxl")
+    caminho = str(tmp_path / 'anos.xlsx')
+    pd.DataFrame([['a', 1, 2], ['b', 3, 4]], columns=['nome', 2021, 2022]).to_excel(caminho, index=False)
+    colunas, opcoes = app.ler_colunas(caminho)
+
+    df = app.ler_arquivo(caminho, [2, 0], [colunas[2], colunas[0]], **opcoes)
+
+    assert df.columns.tolist() == [2022, 'nome']
+    assert df.values.tolist() == [[2, 'a'], [4, 'b']]